@@ -0,0 +1,30 @@
+"""Add composite index for keyset pagination
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-14
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves ORDER BY created_at DESC, id DESC with (created_at, id) < cursor seeks
+    op.create_index(
+        'ix_tasks_created_at_id',
+        'tasks',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
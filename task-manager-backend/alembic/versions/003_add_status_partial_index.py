@@ -0,0 +1,31 @@
+"""Add partial status index for task statistics
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-14
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lets the pending/in_progress FILTER aggregates in get_task_stats use the index
+    op.create_index(
+        'ix_tasks_status_partial',
+        'tasks',
+        ['status'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('pending', 'in_progress')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_status_partial', table_name='tasks')
@@ -0,0 +1,38 @@
+"""Add composite indexes for filtered task listings
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-14
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+FILTER_COLUMNS = ('status', 'priority', 'completed')
+
+
+def upgrade() -> None:
+    # One (filter, created_at DESC, id DESC) index per list filter
+    for column in FILTER_COLUMNS:
+        op.create_index(
+            f'ix_tasks_{column}_created',
+            'tasks',
+            [column, sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False
+        )
+    
+    # Title is never filtered or sorted on
+    op.drop_index(op.f('ix_tasks_title'), table_name='tasks')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_tasks_title'), 'tasks', ['title'], unique=False)
+    for column in FILTER_COLUMNS:
+        op.drop_index(f'ix_tasks_{column}_created', table_name='tasks')
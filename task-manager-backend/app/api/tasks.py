@@ -1,75 +1,107 @@
 """
 API routes for task management
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import math
+import orjson
 
-from app.db.database import get_db
+from app.core import cache
+from app.core.etag import etag_matches, make_body_etag, make_etag, not_modified
+from app.db.database import DBSessionRoute
 from app.schemas import (
     TaskCreate,
     TaskUpdate,
     TaskResponse,
     TaskListResponse,
+    TaskListAdapter,
     MessageResponse
 )
 from app import crud
 
-router = APIRouter(prefix="/tasks", tags=["tasks"])
+router = APIRouter(prefix="/tasks", tags=["tasks"], route_class=DBSessionRoute)
 
 
 @router.get("", response_model=TaskListResponse, summary="Get all tasks")
-def get_tasks(
-    page: int = Query(1, ge=1, description="Page number"),
+async def get_tasks(
+    request: Request,
+    page: int = Query(1, ge=1, description="Page number (deprecated, prefer cursor)"),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
     status: Optional[str] = Query(None, description="Filter by status"),
     priority: Optional[str] = Query(None, description="Filter by priority"),
-    completed: Optional[bool] = Query(None, description="Filter by completion status"),
-    db: Session = Depends(get_db)
+    completed: Optional[bool] = Query(None, description="Filter by completion status")
 ):
     """
     Retrieve all tasks with pagination and optional filters.
     
-    - **page**: Page number (starts at 1)
+    - **page**: Page number (starts at 1, deprecated; ignored when cursor is set)
     - **page_size**: Number of items per page (max 100)
+    - **cursor**: Keyset cursor from the previous response's next_cursor
     - **status**: Filter by status (pending, in_progress, completed)
     - **priority**: Filter by priority (low, medium, high)
     - **completed**: Filter by completion status
+    
+    Responses carry an ETag; send it back as If-None-Match to get an empty
+    304 while the page is unchanged.
     """
+    db: AsyncSession = request.state.db
+    
     skip = (page - 1) * page_size
     
-    tasks, total = crud.get_tasks(
-        db=db,
-        skip=skip,
-        limit=page_size,
-        status=status,
-        priority=priority,
-        completed=completed
-    )
-    
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
-    
-    return TaskListResponse(
-        tasks=tasks,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    try:
+        tasks, total, next_cursor = await crud.get_tasks(
+            db=db,
+            skip=skip,
+            limit=page_size,
+            status=status,
+            priority=priority,
+            completed=completed,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,  # `status` is shadowed by the query parameter here
+            detail=str(e)
+        )
+    
+    total_pages = None
+    if total is not None:
+        total_pages = math.ceil(total / page_size) if total > 0 else 0
+    
+    # Returning a response directly skips response_model re-validation;
+    # TaskListResponse still documents the shape in OpenAPI
+    body = orjson.dumps({
+        "tasks": TaskListAdapter.dump_python(TaskListAdapter.validate_python(tasks), mode="json"),
+        "total": total,
+        "page": page if cursor is None else None,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "next_cursor": next_cursor
+    })
+    
+    # Hashing the page itself keeps conditional requests to the same single
+    # query as plain ones; a 304 saves the transfer, not the lookup
+    etag = make_body_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("/{task_id}", response_model=TaskResponse, summary="Get a task by ID")
-def get_task(
+async def get_task(
     task_id: int,
-    db: Session = Depends(get_db)
+    request: Request
 ):
     """
     Retrieve a specific task by ID.
     
     - **task_id**: The ID of the task to retrieve
     """
-    db_task = crud.get_task(db=db, task_id=task_id)
+    db: AsyncSession = request.state.db
+    db_task = await crud.get_task(db=db, task_id=task_id)
     if db_task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -79,9 +111,9 @@ def get_task(
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED, summary="Create a new task")
-def create_task(
+async def create_task(
     task: TaskCreate,
-    db: Session = Depends(get_db)
+    request: Request
 ):
     """
     Create a new task.
@@ -92,14 +124,15 @@ def create_task(
     - **priority**: Task priority (default: medium)
     - **completed**: Completion status (default: false)
     """
-    return crud.create_task(db=db, task=task)
+    db: AsyncSession = request.state.db
+    return await crud.create_task(db=db, task=task)
 
 
 @router.put("/{task_id}", response_model=TaskResponse, summary="Update a task")
-def update_task(
+async def update_task(
     task_id: int,
     task: TaskUpdate,
-    db: Session = Depends(get_db)
+    request: Request
 ):
     """
     Update an existing task.
@@ -111,7 +144,8 @@ def update_task(
     - **priority**: Updated task priority (optional)
     - **completed**: Updated completion status (optional)
     """
-    db_task = crud.update_task(db=db, task_id=task_id, task_update=task)
+    db: AsyncSession = request.state.db
+    db_task = await crud.update_task(db=db, task_id=task_id, task_update=task)
     if db_task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -121,16 +155,17 @@ def update_task(
 
 
 @router.delete("/{task_id}", response_model=MessageResponse, summary="Delete a task")
-def delete_task(
+async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db)
+    request: Request
 ):
     """
     Delete a task.
     
     - **task_id**: The ID of the task to delete
     """
-    success = crud.delete_task(db=db, task_id=task_id)
+    db: AsyncSession = request.state.db
+    success = await crud.delete_task(db=db, task_id=task_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -140,8 +175,32 @@ def delete_task(
 
 
 @router.get("/stats/summary", response_model=dict, summary="Get task statistics")
-def get_task_stats(db: Session = Depends(get_db)):
+async def get_task_stats(request: Request):
     """
     Get task statistics including total, completed, pending, and in-progress counts.
+    
+    Served from Redis for STATS_CACHE_TTL seconds; writes invalidate the cache.
+    Responses carry an ETag for conditional requests with If-None-Match.
     """
-    return crud.get_task_stats(db=db)
+    db: AsyncSession = request.state.db
+    
+    # With Redis, the write counter answers conditional requests without any lookup
+    version = await cache.get_stats_version()
+    if version is not None:
+        etag = make_etag("stats", version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    
+    # Cached stats are tied to the version read above, so an entry computed
+    # before a concurrent write is never served under the newer ETag
+    stats = await cache.get_cached_stats(version)
+    if stats is None:
+        stats = await crud.get_task_stats(db=db)
+        await cache.set_cached_stats(stats, version)
+    
+    if version is None:
+        etag = make_etag("stats", *sorted(stats.items()))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    
+    return ORJSONResponse(stats, headers={"ETag": etag})
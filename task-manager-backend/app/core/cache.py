@@ -0,0 +1,137 @@
+"""
+Redis cache for frequently polled read endpoints
+"""
+import json
+import logging
+import time
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_KEY = "task:stats"
+STATS_VERSION_KEY = "task:stats:version"
+
+_pool: Optional[aioredis.ConnectionPool] = None
+
+
+def init_cache() -> None:
+    """
+    Create the shared Redis connection pool.
+    
+    Caching stays disabled when REDIS_URL is not configured.
+    """
+    global _pool
+    settings = get_settings()
+    if not settings.REDIS_URL or _pool is not None:
+        return
+    _pool = aioredis.ConnectionPool.from_url(settings.REDIS_URL, max_connections=20)
+    logger.info("Redis cache enabled")
+
+
+async def close_cache() -> None:
+    """Disconnect the shared Redis connection pool"""
+    global _pool
+    if _pool is not None:
+        await _pool.disconnect()
+        _pool = None
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """
+    Get a Redis client backed by the shared pool.
+    
+    Returns:
+        Redis client or None if caching is disabled
+    """
+    if _pool is None:
+        return None
+    return aioredis.Redis(connection_pool=_pool)
+
+
+async def get_cached_stats(version: Optional[str]) -> Optional[dict]:
+    """
+    Get cached task statistics computed under the given version.
+    
+    An entry stored under any other version is ignored, so stats computed
+    just before a concurrent write are never served under the newer ETag.
+    
+    Args:
+        version: Current value of the write counter
+    
+    Returns:
+        Statistics dictionary or None on a cache miss
+    """
+    client = get_redis()
+    if client is None or version is None:
+        return None
+    try:
+        cached = await client.get(STATS_CACHE_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Redis GET {STATS_CACHE_KEY} failed: {e}")
+        return None
+    if not cached:
+        return None
+    entry = json.loads(cached)
+    return entry["stats"] if entry.get("version") == version else None
+
+
+async def set_cached_stats(stats: dict, version: Optional[str]) -> None:
+    """
+    Cache task statistics for STATS_CACHE_TTL seconds.
+    
+    Args:
+        stats: Statistics dictionary
+        version: Write counter value read before the stats were computed
+    """
+    client = get_redis()
+    if client is None or version is None:
+        return
+    entry = json.dumps({"version": version, "stats": stats})
+    try:
+        await client.set(STATS_CACHE_KEY, entry, ex=get_settings().STATS_CACHE_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"Redis SET {STATS_CACHE_KEY} failed: {e}")
+
+
+async def get_stats_version() -> Optional[str]:
+    """
+    Get the counter that is bumped on every task write.
+    
+    A missing counter (e.g. after a Redis restart) is seeded with the
+    current time, here and in invalidate_stats, so versions handed out
+    before the restart never match.
+    
+    Returns:
+        Version string or None if caching is disabled or Redis failed
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        version = await client.get(STATS_VERSION_KEY)
+        if version is None:
+            await client.set(STATS_VERSION_KEY, time.time_ns(), nx=True)
+            version = await client.get(STATS_VERSION_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Redis GET {STATS_VERSION_KEY} failed: {e}")
+        return None
+    return version.decode() if isinstance(version, bytes) else str(version)
+
+
+async def invalidate_stats() -> None:
+    """Drop cached task statistics and bump their version after a write"""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.delete(STATS_CACHE_KEY)
+        # INCR on a missing key would restart at 1 and reissue old versions
+        await client.set(STATS_VERSION_KEY, time.time_ns(), nx=True)
+        await client.incr(STATS_VERSION_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Redis invalidation of {STATS_CACHE_KEY} failed: {e}")
@@ -0,0 +1,64 @@
+"""
+HTTP conditional GET helpers (ETag / If-None-Match)
+"""
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Build a strong ETag from the values that determine a response.
+    
+    Args:
+        parts: Values that change whenever the response body changes
+    
+    Returns:
+        Quoted ETag header value
+    """
+    digest = hashlib.blake2s(":".join(map(str, parts)).encode()).hexdigest()[:16]
+    return f'"{digest}"'
+
+
+def make_body_etag(body: bytes) -> str:
+    """
+    Build a strong ETag by hashing a serialized response body.
+    
+    Args:
+        body: Response body exactly as it will be sent
+    
+    Returns:
+        Quoted ETag header value
+    """
+    return f'"{hashlib.blake2s(body).hexdigest()[:16]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the client already holds the representation for etag.
+    
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+    
+    Returns:
+        True if If-None-Match lists etag (or is "*")
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Build an empty 304 response carrying the ETag.
+    
+    Args:
+        etag: Current ETag of the resource
+    
+    Returns:
+        304 Not Modified response
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -1,27 +1,71 @@
 """
 Logging configuration for the application
 """
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 
 # Create logs directory if it doesn't exist
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
 
+# Rotate log files at 50 MB, keeping 5 backups
+LOG_FILE_MAX_BYTES = 50_000_000
+LOG_FILE_BACKUP_COUNT = 5
+
+_listener: Optional[QueueListener] = None
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that reuses the formatted timestamp within the same second.
+    
+    The date format has one-second resolution, so records created in the
+    same second share one strftime call instead of paying it per handler.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_time: tuple[int, str] = (-1, "")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        cached_second, cached_time = self._cached_time
+        if second != cached_second:
+            cached_time = super().formatTime(record, datefmt)
+            self._cached_time = (second, cached_time)
+        return cached_time
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the background logging thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logging(log_level: str = "INFO") -> None:
     """
     Configure application logging with both file and console handlers.
     
+    The root logger only enqueues records; a QueueListener thread formats
+    them and does the console/file I/O off the request path.
+    
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
+    global _listener
+    
     # Convert string to logging level
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
     
-    # Create formatter
-    formatter = logging.Formatter(
+    # Create one formatter shared by all handlers
+    formatter = CachedTimeFormatter(
         fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
@@ -31,31 +75,54 @@ def setup_logging(log_level: str = "INFO") -> None:
     root_logger.setLevel(numeric_level)
     
     # Remove existing handlers
+    _stop_listener()
     root_logger.handlers.clear()
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
     
     # File handler for all logs
-    file_handler = logging.FileHandler(LOGS_DIR / "app.log", encoding="utf-8")
+    file_handler = RotatingFileHandler(
+        LOGS_DIR / "app.log",
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUP_COUNT,
+        encoding="utf-8"
+    )
     file_handler.setLevel(numeric_level)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
     
     # Error file handler
-    error_handler = logging.FileHandler(LOGS_DIR / "error.log", encoding="utf-8")
+    error_handler = RotatingFileHandler(
+        LOGS_DIR / "error.log",
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUP_COUNT,
+        encoding="utf-8"
+    )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(formatter)
-    root_logger.addHandler(error_handler)
+    
+    # Hand records to a background thread that writes to the real handlers
+    log_queue: queue.Queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        error_handler,
+        respect_handler_level=True
+    )
+    _listener.start()
     
     # Reduce noise from third-party libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("asyncio").setLevel(logging.WARNING)
 
 
+atexit.register(_stop_listener)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a specific module.
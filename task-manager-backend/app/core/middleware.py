@@ -15,7 +15,10 @@ logger = logging.getLogger(__name__)
 
 async def log_requests_middleware(request: Request, call_next: Callable) -> Response:
     """
-    Middleware to log all incoming requests and responses.
+    Middleware to log all requests with their status and processing time.
+    
+    Logs one line per completed request, formatted lazily so nothing is
+    built when INFO is disabled.
     
     Args:
         request: Incoming request
@@ -24,40 +27,40 @@ async def log_requests_middleware(request: Request, call_next: Callable) -> Resp
     Returns:
         Response from the handler
     """
-    start_time = time.time()
-    
-    # Log incoming request
-    logger.info(
-        f"Incoming request: {request.method} {request.url.path} "
-        f"- Client: {request.client.host if request.client else 'unknown'}"
-    )
+    start_ns = time.perf_counter_ns()
     
     # Process request
     try:
         response = await call_next(request)
-        
-        # Calculate processing time
-        process_time = time.time() - start_time
-        
-        # Log response
-        logger.info(
-            f"Completed request: {request.method} {request.url.path} "
-            f"- Status: {response.status_code} - Time: {process_time:.3f}s"
-        )
-        
-        # Add custom header with processing time
-        response.headers["X-Process-Time"] = str(process_time)
-        
-        return response
-    
     except Exception as e:
-        process_time = time.time() - start_time
         logger.error(
-            f"Request failed: {request.method} {request.url.path} "
-            f"- Error: {str(e)} - Time: {process_time:.3f}s",
+            "Request failed: %s %s - Error: %s - Time: %dus",
+            request.method,
+            request.url.path,
+            e,
+            (time.perf_counter_ns() - start_ns) // 1000,
             exc_info=True
         )
         raise
+    
+    # Calculate processing time
+    duration_ns = time.perf_counter_ns() - start_ns
+    
+    # Add custom header with processing time in seconds
+    response.headers["X-Process-Time"] = f"{duration_ns / 1e9:.6f}"
+    
+    # Log response
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Request: %s %s - Client: %s - Status: %d - Time: %dus",
+            request.method,
+            request.url.path,
+            request.client.host if request.client else "unknown",
+            response.status_code,
+            duration_ns // 1000
+        )
+    
+    return response
 
 
 async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> JSONResponse:
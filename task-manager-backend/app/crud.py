@@ -1,14 +1,99 @@
 """
 CRUD operations for Task model
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from sqlalchemy import Select, delete, func, literal, select, tuple_, update
 from typing import Optional
+from app.core import cache
 from app.db.models import Task
 from app.schemas import TaskCreate, TaskUpdate
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
-def get_task(db: Session, task_id: int) -> Optional[Task]:
+# tasks.id is an INTEGER (int4) column
+_MAX_TASK_ID = 2**31 - 1
+
+# ORM read queries refuse lazy loads so a relationship added to Task later
+# fails loudly instead of issuing one SELECT per row; load it explicitly
+# with selectinload()/joinedload() where it is needed.
+_NO_LAZY_LOADS = raiseload("*")
+
+# List pages are read-only, so they select plain columns: Core rows skip
+# ORM identity-map bookkeeping and instrumented attribute access.
+_TASK_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.completed,
+    Task.created_at,
+    Task.updated_at,
+)
+
+
+def encode_cursor(created_at: datetime, task_id: int) -> str:
+    """
+    Build an opaque keyset cursor pointing just past the given task
+    
+    Args:
+        created_at: Creation time of the last task of the current page
+        task_id: ID of the last task of the current page
+    
+    Returns:
+        URL-safe base64 of "<created_at epoch microseconds>:<id>"
+    """
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    micros = (created_at - _EPOCH) // timedelta(microseconds=1)
+    return base64.urlsafe_b64encode(f"{micros}:{task_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor
+    
+    Args:
+        cursor: Opaque cursor string
+    
+    Returns:
+        Tuple of (created_at, id) of the last task already returned
+    
+    Raises:
+        ValueError: If the cursor is malformed or out of range
+    """
+    try:
+        raw_micros, raw_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        created_at = _EPOCH + timedelta(microseconds=int(raw_micros))
+        task_id = int(raw_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, OverflowError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if not 1 <= task_id <= _MAX_TASK_ID:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return created_at, task_id
+
+
+def _task_filters(
+    status: Optional[str],
+    priority: Optional[str],
+    completed: Optional[bool]
+) -> list:
+    """Build WHERE clauses for the list filters that are set"""
+    filters = []
+    if status is not None:
+        filters.append(Task.status == status)
+    if priority is not None:
+        filters.append(Task.priority == priority)
+    if completed is not None:
+        filters.append(Task.completed == completed)
+    return filters
+
+
+async def get_task(db: AsyncSession, task_id: int) -> Optional[Task]:
     """
     Get a single task by ID
     
@@ -19,51 +104,93 @@ def get_task(db: Session, task_id: int) -> Optional[Task]:
     Returns:
         Task object or None if not found
     """
-    return db.query(Task).filter(Task.id == task_id).first()
+    result = await db.execute(select(Task).where(Task.id == task_id).options(_NO_LAZY_LOADS))
+    return result.scalar_one_or_none()
 
 
-def get_tasks(
-    db: Session,
+async def get_tasks(
+    db: AsyncSession,
     skip: int = 0,
     limit: int = 10,
     status: Optional[str] = None,
     priority: Optional[str] = None,
-    completed: Optional[bool] = None
-) -> tuple[list[Task], int]:
+    completed: Optional[bool] = None,
+    cursor: Optional[str] = None
+) -> tuple[list[dict], Optional[int], Optional[str]]:
     """
     Get all tasks with optional filtering and pagination
     
+    Tasks are ordered by (created_at, id) descending. When a cursor is
+    given the page starts right after it (keyset pagination), skip is
+    ignored and no total is computed; offset-based skip is kept for
+    page-number clients and returns the filtered total via COUNT(*) OVER ()
+    in the same query as the page.
+    
     Args:
         db: Database session
-        skip: Number of records to skip
+        skip: Number of records to skip (deprecated, prefer cursor)
         limit: Maximum number of records to return
         status: Filter by status
         priority: Filter by priority
         completed: Filter by completion status
+        cursor: Opaque cursor returned with the previous page
     
     Returns:
-        Tuple of (list of tasks, total count)
-    """
-    query = db.query(Task)
+        Tuple of (list of task column dicts, total count or None, next cursor or None)
     
-    # Apply filters
-    if status is not None:
-        query = query.filter(Task.status == status)
-    if priority is not None:
-        query = query.filter(Task.priority == priority)
-    if completed is not None:
-        query = query.filter(Task.completed == completed)
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    filters = _task_filters(status, priority, completed)
     
-    # Get total count
-    total = query.count()
+    # Apply ordering and pagination; one extra row tells us if there is a next page
+    order_by = (Task.created_at.desc(), Task.id.desc())
+    stmt: Select
+    if cursor is not None:
+        created_at, task_id = decode_cursor(cursor)
+        stmt = (
+            select(*_TASK_COLUMNS)
+            .where(*filters, tuple_(Task.created_at, Task.id) < tuple_(
+                # Bind with the column types so the values use the stored format
+                literal(created_at, Task.created_at.type),
+                literal(task_id, Task.id.type)
+            ))
+            .order_by(*order_by)
+            .limit(limit + 1)
+        )
+        rows = (await db.execute(stmt)).mappings().all()
+        tasks = [dict(row) for row in rows]
+        total = None
+    else:
+        # The window count is evaluated over all filtered rows before OFFSET/LIMIT
+        stmt = (
+            select(*_TASK_COLUMNS, func.count().over().label("total"))
+            .where(*filters)
+            .order_by(*order_by)
+            .offset(skip)
+            .limit(limit + 1)
+        )
+        rows = (await db.execute(stmt)).mappings().all()
+        tasks = [dict(row) for row in rows]
+        if tasks:
+            total = tasks[0]["total"]
+            for task in tasks:
+                del task["total"]
+        elif skip:
+            # Past the last page there is no row to carry the window count
+            total = (await db.execute(select(func.count(Task.id)).where(*filters))).scalar_one()
+        else:
+            total = 0
     
-    # Apply pagination and ordering
-    tasks = query.order_by(Task.created_at.desc()).offset(skip).limit(limit).all()
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor(tasks[-1]["created_at"], tasks[-1]["id"])
     
-    return tasks, total
+    return tasks, total, next_cursor
 
 
-def create_task(db: Session, task: TaskCreate) -> Task:
+async def create_task(db: AsyncSession, task: TaskCreate) -> Task:
     """
     Create a new task
     
@@ -76,12 +203,13 @@ def create_task(db: Session, task: TaskCreate) -> Task:
     """
     db_task = Task(**task.model_dump())
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    await db.commit()
+    await cache.invalidate_stats()
+    await db.refresh(db_task)
     return db_task
 
 
-def update_task(db: Session, task_id: int, task_update: TaskUpdate) -> Optional[Task]:
+async def update_task(db: AsyncSession, task_id: int, task_update: TaskUpdate) -> Optional[Task]:
     """
     Update an existing task
     
@@ -93,21 +221,29 @@ def update_task(db: Session, task_id: int, task_update: TaskUpdate) -> Optional[
     Returns:
         Updated task object or None if not found
     """
-    db_task = get_task(db, task_id)
-    if db_task is None:
-        return None
-    
     # Update only provided fields
     update_data = task_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_task, field, value)
+    if not update_data:
+        return await get_task(db, task_id)
     
-    db.commit()
-    db.refresh(db_task)
+    # Single UPDATE ... RETURNING round-trip instead of SELECT + UPDATE + refresh
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(**update_data)
+        .returning(Task)
+        .execution_options(synchronize_session=False)
+    )
+    db_task = (await db.execute(stmt)).scalar_one_or_none()
+    if db_task is None:
+        return None
+    
+    await db.commit()
+    await cache.invalidate_stats()
     return db_task
 
 
-def delete_task(db: Session, task_id: int) -> bool:
+async def delete_task(db: AsyncSession, task_id: int) -> bool:
     """
     Delete a task
     
@@ -118,16 +254,22 @@ def delete_task(db: Session, task_id: int) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    db_task = get_task(db, task_id)
-    if db_task is None:
+    stmt = (
+        delete(Task)
+        .where(Task.id == task_id)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted_id = (await db.execute(stmt)).scalar_one_or_none()
+    if deleted_id is None:
         return False
     
-    db.delete(db_task)
-    db.commit()
+    await db.commit()
+    await cache.invalidate_stats()
     return True
 
 
-def get_task_stats(db: Session) -> dict:
+async def get_task_stats(db: AsyncSession) -> dict:
     """
     Get task statistics
     
@@ -137,14 +279,18 @@ def get_task_stats(db: Session) -> dict:
     Returns:
         Dictionary with task statistics
     """
-    total = db.query(func.count(Task.id)).scalar()
-    completed = db.query(func.count(Task.id)).filter(Task.completed == True).scalar()
-    pending = db.query(func.count(Task.id)).filter(Task.status == "pending").scalar()
-    in_progress = db.query(func.count(Task.id)).filter(Task.status == "in_progress").scalar()
+    # Single pass over the table using aggregate FILTER clauses
+    stmt = select(
+        func.count(Task.id).label("total"),
+        func.count(Task.id).filter(Task.completed == True).label("completed"),
+        func.count(Task.id).filter(Task.status == "pending").label("pending"),
+        func.count(Task.id).filter(Task.status == "in_progress").label("in_progress"),
+    )
+    row = (await db.execute(stmt)).one()
     
     return {
-        "total": total,
-        "completed": completed,
-        "pending": pending,
-        "in_progress": in_progress
+        "total": row.total,
+        "completed": row.completed,
+        "pending": row.pending,
+        "in_progress": row.in_progress
     }
@@ -1,35 +1,117 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import inspect
+from asyncio import current_task
+from contextlib import AsyncExitStack
+from typing import Any, Callable
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_scoped_session,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import declarative_base
 from app.core.config import get_settings
 
 settings = get_settings()
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
+
+def get_async_database_url(url: str) -> str:
+    """
+    Point a plain postgresql:// URL at the asyncpg driver.
+    
+    Args:
+        url: Database URL as configured (also used by Alembic with psycopg2)
+    
+    Returns:
+        Database URL for the async engine
+    """
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+# Create SQLAlchemy async engine
+engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE
 )
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# One session per asyncio task (i.e. per request); code running inside the
+# request can call ScopedSession() to get the same session without passing it
+ScopedSession = async_scoped_session(SessionLocal, scopefunc=current_task)
 
 # Create Base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """
     Dependency to get database session.
-    Yields a database session and closes it after use.
+    Yields the request's scoped database session and closes it after use.
     """
-    db = SessionLocal()
+    db = ScopedSession()
     try:
         yield db
     finally:
-        db.close()
+        await ScopedSession.remove()
+
+
+async def _enter_session(stack: AsyncExitStack, provider: Callable[[], Any]) -> Any:
+    """
+    Call a get_db-style provider and register its cleanup on the stack.
+    
+    Accepts the same shapes FastAPI does for a dependency: an async
+    generator, a sync generator, or a plain (possibly awaitable) return value.
+    """
+    result = provider()
+    if inspect.isasyncgen(result):
+        stack.push_async_callback(result.aclose)
+        return await result.__anext__()
+    if inspect.isgenerator(result):
+        stack.callback(result.close)
+        return next(result)
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+class DBSessionRoute(APIRoute):
+    """
+    Route class that opens the request's database session around the handler.
+    
+    Handlers read the session from request.state.db instead of declaring a
+    Depends(get_db) parameter, which keeps the generator dependency out of
+    FastAPI's per-request dependency resolution. An app.dependency_overrides
+    entry for get_db is used instead when present; like a FastAPI dependency
+    it may be an async generator, a sync generator or return the session.
+    """
+    
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+        
+        async def db_session_route_handler(request: Request) -> Response:
+            provider = request.app.dependency_overrides.get(get_db, get_db)
+            stack = AsyncExitStack()
+            try:
+                request.state.db = await _enter_session(stack, provider)
+                return await route_handler(request)
+            finally:
+                await stack.aclose()
+        
+        return db_session_route_handler
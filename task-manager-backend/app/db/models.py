@@ -1,10 +1,19 @@
 """
 SQLAlchemy database models
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.sql import func
 from app.db.database import Base
 
+# SQLite stores datetimes as text and compares them as strings. Its
+# CURRENT_TIMESTAMP default has no fractional part, so bound values must use
+# the same format or keyset comparisons on created_at go wrong.
+_SQLITE_DATETIME = sqlite.DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+_TIMESTAMP = DateTime(timezone=True).with_variant(_SQLITE_DATETIME, "sqlite")
+
 
 class Task(Base):
     """Task model for storing task information"""
@@ -12,13 +21,28 @@ class Task(Base):
     __tablename__ = "tasks"
     
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(255), nullable=False, index=True)
+    title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     status = Column(String(50), default="pending", nullable=False)
     priority = Column(String(50), default="medium", nullable=False)
     completed = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = Column(_TIMESTAMP, server_default=func.now(), nullable=False)
+    updated_at = Column(_TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_tasks_created_at_id", created_at.desc(), id.desc()),
+        # Filtered listings: WHERE <column> = ? ORDER BY created_at DESC, id DESC
+        Index("ix_tasks_status_created", status, created_at.desc(), id.desc()),
+        Index("ix_tasks_priority_created", priority, created_at.desc(), id.desc()),
+        Index("ix_tasks_completed_created", completed, created_at.desc(), id.desc()),
+        # Stats FILTER (WHERE status = ...) aggregates
+        Index(
+            "ix_tasks_status_partial",
+            status,
+            postgresql_where=status.in_(["pending", "in_progress"]),
+        ),
+    )
     
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status}')>"
@@ -1,7 +1,7 @@
 """
 Pydantic schemas for request/response validation
 """
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 from datetime import datetime
 from typing import Optional
 
@@ -38,13 +38,20 @@ class TaskResponse(TaskBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Built once at import. The list route validates its column dicts into
+# TaskResponse and dumps them to JSON-ready data in one pass over the page,
+# without building a TaskListResponse around them
+TaskListAdapter = TypeAdapter(list[TaskResponse])
+
+
 class TaskListResponse(BaseModel):
     """Schema for paginated task list response"""
     tasks: list[TaskResponse]
-    total: int
-    page: int
+    total: Optional[int] = Field(None, description="Total matching tasks (null when paginating by cursor)")
+    page: Optional[int] = Field(None, description="Page number (null when paginating by cursor)")
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = Field(None, description="Total pages (null when paginating by cursor)")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (null on the last page)")
 
 
 class ErrorResponse(BaseModel):
@@ -1,71 +1,168 @@
 """
 Pytest configuration and fixtures
 """
+import os
+from contextlib import asynccontextmanager
+
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from pytest_asyncio import is_async_test
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.pool import StaticPool
 
+# Never reach a Redis configured in a developer's .env (environment variables
+# win over it): cached stats would outlive each test's rollback and leak
+# into the next test. Tests that need a cache patch one in themselves.
+os.environ["REDIS_URL"] = ""
+
 from app.main import app
 from app.db.database import Base, get_db
 from app.db.models import Task
 
-# Use in-memory SQLite database for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Use in-memory SQLite database for testing; each pytest-xdist worker process
+# gets its own
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
-engine = create_engine(
+engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+@event.listens_for(engine.sync_engine, "connect")
+def _configure_sqlite(dbapi_connection, connection_record):
+    # aiosqlite's own BEGIN handling breaks SAVEPOINTs; let SQLAlchemy emit it
+    dbapi_connection.isolation_level = None
+    # Test data is throwaway: never wait on syncs or journal/temp files
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database session for each test"""
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-        Base.metadata.drop_all(bind=engine)
 
+@event.listens_for(engine.sync_engine, "begin")
+def _begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+def pytest_collection_modifyitems(items):
+    """Run every test on the session event loop the fixtures share"""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session")
+async def client():
+    """
+    Create one in-process test client for the suite.
+    
+    Requests go straight to the ASGI app on the test's event loop; startup
+    and shutdown events, routing and OpenAPI setup run once.
+    """
+    transport = ASGITransport(app=app)
+    # Ask for compressed bodies like a browser would, so tests go through GZip
+    headers = {"Accept-Encoding": "gzip, deflate"}
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=transport, base_url="http://test", headers=headers) as test_client:
+            yield test_client
 
-@pytest.fixture(scope="function")
-def client(db_session):
-    """Create a test client with overridden database dependency"""
-    def override_get_db():
+
+@pytest.fixture(scope="session")
+async def _schema():
+    """Create the tables once for the whole session"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+async def connection(_schema):
+    """Single connection that every test's transaction runs on"""
+    conn = await engine.connect()
+    yield conn
+    await conn.close()
+
+
+@asynccontextmanager
+async def _rolled_back_session(connection):
+    """
+    Open a session shared with the application inside a transaction that
+    is rolled back on exit.
+    
+    Commits in the application only release a SAVEPOINT, so nothing written
+    through the session outlives the block.
+    """
+    trans = await connection.begin()
+    session = AsyncSession(
+        bind=connection,
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    
+    async def override_get_db():
         try:
-            yield db_session
+            yield session
         finally:
-            pass
+            # Each request starts with an empty identity map, as it would
+            # with its own session
+            session.expunge_all()
     
+    # The app is imported once for the whole run; only this override is
+    # swapped per test, and whatever was there before is put back
+    previous_override = app.dependency_overrides.get(get_db)
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
-        yield test_client
-    app.dependency_overrides.clear()
+    try:
+        yield session
+    finally:
+        if previous_override is None:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous_override
+        await session.close()
+        await trans.rollback()
 
 
-@pytest.fixture
-def sample_task_data():
-    """Sample task data for testing"""
-    return {
-        "title": "Test Task",
-        "description": "This is a test task",
-        "status": "pending",
-        "priority": "high",
-        "completed": False
-    }
+@pytest.fixture(scope="session", autouse=True)
+async def _warmup(client, connection):
+    """
+    Send one request per code path before any test runs.
+    
+    First requests pay one-off costs (validator and serializer builds,
+    route and dependency setup) that would otherwise land on whichever
+    test happens to run first.
+    """
+    async with _rolled_back_session(connection):
+        await client.get("/health")
+        response = await client.post("/api/v1/tasks", json={"title": "warmup"})
+        if response.status_code == 201:
+            await client.delete(f"/api/v1/tasks/{response.json()['id']}")
+
+
+@pytest.fixture(autouse=True)
+async def db(connection):
+    """
+    Database session for one test, shared with the application.
+    
+    The test runs inside a transaction that is rolled back afterwards, so
+    no test sees another test's rows.
+    """
+    async with _rolled_back_session(connection) as session:
+        yield session
 
 
 @pytest.fixture
-def create_sample_task(db_session):
+def create_sample_task(db):
     """Helper fixture to create a task in the database"""
-    def _create_task(**kwargs):
+    async def _create_task(**kwargs):
         task_data = {
             "title": "Sample Task",
             "description": "Sample description",
@@ -76,9 +173,49 @@ def create_sample_task(db_session):
         task_data.update(kwargs)
         
         task = Task(**task_data)
-        db_session.add(task)
-        db_session.commit()
-        db_session.refresh(task)
+        db.add(task)
+        await db.commit()
+        await db.refresh(task)
+        db.expunge(task)
         return task
     
     return _create_task
+
+
+@pytest.fixture
+def bulk_create_sample_tasks(db):
+    """Helper fixture to insert many tasks in one statement and commit"""
+    async def _create_tasks(n=0, rows=None, **defaults):
+        # Either n default rows or the given partial rows, filled in
+        if rows is None:
+            rows = [{} for _ in range(n)]
+        rows = [
+            {
+                "title": f"Task {i+1}",
+                "status": "pending",
+                "priority": "medium",
+                "completed": False,
+                **defaults,
+                **row
+            }
+            for i, row in enumerate(rows)
+        ]
+        await db.execute(insert(Task), rows)
+        await db.commit()
+    
+    return _create_tasks
+
+
+@pytest.fixture
+def captured_sql():
+    """List that collects every SQL statement executed during the test"""
+    statements = []
+    
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _capture)